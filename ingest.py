@@ -8,13 +8,31 @@ Author: Adam Danisovszky
 Date: 2026-01-08
 """
 
+import asyncio
+import csv
+import email.utils
+import functools
+import io
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from google.api_core.exceptions import NotFound
 from google.cloud import bigquery
+from google.cloud import storage
 from google.oauth2 import service_account
 import sys
-from datetime import datetime
-from typing import Dict, List, Tuple
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
 import logging
 
 # Configure logging
@@ -28,14 +46,65 @@ logger = logging.getLogger(__name__)
 PROJECT_ID = "enduring-broker-483700-j3"
 DATASET_ID = "candidate_adamdanisovszky_mental_health"  # Replace 'yourname' with your actual name
 TABLE_ID = "raw_cdc_brfss"
-CDC_API_BASE = "https://data.cdc.gov/resource/dttw-5yxu.json"
+CDC_API_BASE = "https://data.cdc.gov/resource/dttw-5yxu.csv"
 SERVICE_ACCOUNT_KEY = "enduring-broker-483700-j3@appspot.gserviceaccount.com"  # Optional: set to None for default credentials
 
+# Extraction configuration
+PAGE_SIZE = 10000  # Socrata's soft cap on records per request
+FETCH_CONCURRENCY = 16  # Maximum number of in-flight page requests
+CSV_BLOCK_SIZE = 8 << 20  # Bytes handed to each Arrow CSV parser block
+
+# Retry policy for CDC API requests (Socrata throttles bursts with HTTP 429)
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 0.5  # Seconds; doubled on each retry
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+# Shared HTTP session for the synchronous record count query; page fetches
+# go through aiohttp in _fetch_page with the same retry policy
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept-Encoding": "gzip"})
+_SESSION.mount("https://", HTTPAdapter(
+    max_retries=Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES
+    )
+))
+
+# Staging configuration (large pulls)
+GCS_BUCKET = None  # Set to a bucket name to stream pages to GCS instead of holding them in memory
+GCS_BLOB_NAME = "raw_cdc_brfss/brfss.parquet"
+
+# Load configuration
+LOAD_CONCURRENCY = 4  # Number of DataFrame chunks loaded by parallel BigQuery jobs
+STAGING_TABLE_SUFFIX = "__staging"  # Prefix of the per-run table loads land in before replacing the target
+BIGQUERY_SCHEMA = [
+    bigquery.SchemaField("year", "INT64"),
+    bigquery.SchemaField("locationabbr", "STRING"),
+    bigquery.SchemaField("locationdesc", "STRING"),
+    bigquery.SchemaField("class", "STRING"),
+    bigquery.SchemaField("topic", "STRING"),
+    bigquery.SchemaField("question", "STRING"),
+    bigquery.SchemaField("data_value", "FLOAT64"),
+    bigquery.SchemaField("sample_size", "INT64"),
+]
+PARTITION_YEAR_RANGE = (2000, 2035, 1)  # (start, end, interval) for integer range partitioning on year
+CLUSTERING_FIELDS = ['locationabbr', 'topic']
+
 # Validation configuration
 EXPECTED_COLUMNS = [
     'year', 'locationabbr', 'locationdesc', 'class', 'topic', 
     'question', 'data_value', 'sample_size'
 ]
+INTEGER_COLUMNS = ['year', 'sample_size']
+FLOAT_COLUMNS = ['data_value']
+CATEGORICAL_COLUMNS = ['locationabbr', 'locationdesc', 'class', 'topic', 'question']
+
+# Values matching these patterns are converted; anything else becomes null.
+# Integers are capped at 9 digits so they always fit in int32.
+_INTEGER_PATTERN = r"^[-+]?\d{1,9}$"
+_FLOAT_PATTERN = r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$"
+EXPECTED_COLUMNS_SET = frozenset(EXPECTED_COLUMNS)
 MIN_ROW_COUNT = 100
 MAX_NULL_PERCENTAGE = 50.0  # Maximum percentage of nulls allowed per column
 
@@ -45,9 +114,13 @@ class ValidationError(Exception):
     pass
 
 
-def fetch_brfss_data(limit: int = 10000, offset: int = 0, filters: Dict = None) -> List[Dict]:
+def _page_params(limit: int, offset: int, filters: Dict = None) -> Dict:
     """
-    Fetch data from CDC BRFSS API
+    Build the query parameters for a single page request
+    
+    Only EXPECTED_COLUMNS are requested and rows are ordered by the internal
+    row ID so that pages neither overlap nor skip rows. Filters may override
+    either default.
     
     Args:
         limit: Number of records to fetch per request
@@ -55,12 +128,11 @@ def fetch_brfss_data(limit: int = 10000, offset: int = 0, filters: Dict = None)
         filters: Dictionary of filter parameters
     
     Returns:
-        List of records from the API
-    
-    Raises:
-        requests.exceptions.RequestException: If API request fails
+        Dictionary of query parameters
     """
     params = {
+        "$select": ",".join(EXPECTED_COLUMNS),
+        "$order": ":id",
         "$limit": limit,
         "$offset": offset
     }
@@ -68,70 +140,529 @@ def fetch_brfss_data(limit: int = 10000, offset: int = 0, filters: Dict = None)
     if filters:
         params.update(filters)
     
-    logger.info(f"Fetching data from CDC API (offset: {offset}, limit: {limit})...")
+    return params
+
+
+def fetch_brfss_count(filters: Dict = None) -> int:
+    """
+    Fetch the total number of records matching the filters
+    
+    Args:
+        filters: Dictionary of filter parameters
+    
+    Returns:
+        Number of matching records
+    
+    Raises:
+        requests.exceptions.RequestException: If API request fails
+    """
+    # Only row filters apply to the count; projection and paging do not
+    params = {
+        key: value for key, value in (filters or {}).items()
+        if key not in ("$select", "$order", "$limit", "$offset")
+    }
+    params["$select"] = "count(*)"
     
     try:
-        response = requests.get(CDC_API_BASE, params=params, timeout=60)
+        response = _SESSION.get(CDC_API_BASE, params=params, timeout=60)
         response.raise_for_status()
-        data = response.json()
-        logger.info(f"Successfully fetched {len(data)} records")
-        return data
+        data = pa_csv.read_csv(pa.py_buffer(response.content))
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching data from CDC API: {e}")
+        logger.error("Error fetching record count from CDC API: %s", e)
         raise
+    
+    count = int(data.column(0)[0].as_py()) if data.num_rows else 0
+    logger.info("CDC API reports %s matching records", count)
+    return count
+
+
+def _parse_csv_page(body: bytes) -> pa.Table:
+    """
+    Parse a CSV response body into an Arrow table
+    
+    Args:
+        body: Raw CSV bytes returned by the API
+    
+    Returns:
+        Arrow table of the records in the page
+    """
+    # Read every column as a string so that each page parses to the same
+    # schema and a malformed numeric cell cannot fail the whole page
+    header = next(csv.reader([body.split(b"\n", 1)[0].decode("utf-8")]), [])
+    
+    table = pa_csv.read_csv(
+        pa.py_buffer(body),
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        # Empty fields are nulls, as the JSON API omitted them
+        convert_options=pa_csv.ConvertOptions(
+            column_types={column: pa.string() for column in header},
+            strings_can_be_null=True
+        )
+    )
+    return _coerce_numeric_columns(table)
 
 
-def fetch_all_brfss_data(filters: Dict = None, max_records: int = None) -> List[Dict]:
+def _coerce_numeric_columns(table: pa.Table) -> pa.Table:
     """
-    Fetch all available BRFSS data with pagination
+    Convert the numeric columns of a page from strings to numbers
+    
+    Values that are not valid numbers become nulls and surface in the null
+    checks. Integers become int32 (lossless for these columns); floats stay
+    float64 to match the FLOAT64 table column exactly.
+    
+    Args:
+        table: Arrow table with string columns
+    
+    Returns:
+        Arrow table with typed numeric columns
+    """
+    conversions = (
+        [(column, _INTEGER_PATTERN, pa.int32()) for column in INTEGER_COLUMNS] +
+        [(column, _FLOAT_PATTERN, pa.float64()) for column in FLOAT_COLUMNS]
+    )
+    
+    for column, pattern, target_type in conversions:
+        index = table.schema.get_field_index(column)
+        if index < 0:
+            continue
+        
+        values = pc.utf8_trim_whitespace(table.column(index))
+        valid = pc.match_substring_regex(values, pattern)
+        numbers = pc.if_else(valid, values, pa.scalar(None, pa.string())).cast(target_type)
+        table = table.set_column(index, column, numbers)
+    
+    return table
+
+
+def _retry_delay(attempt: int, retry_after: str = None) -> float:
+    """
+    Compute how long to wait before retrying a CDC API request
+    
+    Args:
+        attempt: Zero-based number of the attempt that failed
+        retry_after: Retry-After header of the response, if any
+    
+    Returns:
+        Delay in seconds
+    """
+    if retry_after:
+        # Retry-After is either a number of seconds or an HTTP date
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    
+    return RETRY_BACKOFF_FACTOR * (2 ** attempt)
+
+
+async def _fetch_page(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    limit: int,
+    offset: int,
+    filters: Dict = None
+) -> pa.Table:
+    """
+    Fetch a single page from CDC BRFSS API without blocking other pages
+    
+    Throttling (RETRY_STATUS_CODES) and connection errors are retried up to
+    RETRY_TOTAL times with exponential backoff, honouring Retry-After.
+    
+    Args:
+        session: Shared aiohttp session
+        semaphore: Semaphore bounding the number of in-flight requests
+        limit: Number of records to fetch per request
+        offset: Starting position for pagination
+        filters: Dictionary of filter parameters
+    
+    Returns:
+        Arrow table of records from the API
+    
+    Raises:
+        aiohttp.ClientError: If API request fails
+        ValueError: If the API rejects the query, e.g. for a missing column
+    """
+    params = _page_params(limit, offset, filters)
+    
+    async with semaphore:
+        logger.info("Fetching data from CDC API (offset: %s, limit: %s)...", offset, limit)
+        
+        # The semaphore slot is held while backing off, so throttling also
+        # slows down the other pages instead of piling more requests on
+        for attempt in range(RETRY_TOTAL + 1):
+            retry_after = None
+            try:
+                async with session.get(CDC_API_BASE, params=params) as response:
+                    if response.status in RETRY_STATUS_CODES and attempt < RETRY_TOTAL:
+                        retry_after = response.headers.get("Retry-After")
+                        reason = f"HTTP {response.status}"
+                    elif response.status == 400:
+                        # Socrata rejects a $select naming a column that no
+                        # longer exists, so say which columns were requested
+                        message = (await response.text()).strip()
+                        logger.error("CDC API rejected the query (offset: %s): %s", offset, message)
+                        raise ValueError(
+                            f"CDC API rejected the query (HTTP 400): {message}. "
+                            f"Check that every $select column still exists: {params['$select']}"
+                        )
+                    else:
+                        response.raise_for_status()
+                        body = await response.read()
+                        break
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == RETRY_TOTAL:
+                    logger.error("Error fetching data from CDC API (offset: %s): %s", offset, e)
+                    raise
+                reason = repr(e)
+            except aiohttp.ClientError as e:
+                logger.error("Error fetching data from CDC API (offset: %s): %s", offset, e)
+                raise
+            
+            delay = _retry_delay(attempt, retry_after)
+            logger.warning(
+                "Retrying CDC API request (offset: %s) in %.1fs after %s",
+                offset, delay, reason
+            )
+            await asyncio.sleep(delay)
+    
+    # Parse off the event loop (Arrow releases the GIL) so the next requests
+    # keep downloading while this page is being parsed
+    data = await asyncio.to_thread(_parse_csv_page, body)
+    logger.info("Successfully fetched %s records (offset: %s)", data.num_rows, offset)
+    return data
+
+
+async def _fetch_pages(
+    windows: List[Tuple[int, int]],
+    filters: Dict = None,
+    on_page: Callable[[pa.Table], None] = None
+) -> List[pa.Table]:
+    """
+    Fetch all pages concurrently
+    
+    Args:
+        windows: List of (offset, limit) pairs to fetch
+        filters: Dictionary of filter parameters
+        on_page: Optional callback that consumes each page as it arrives, in
+            completion order, instead of the pages being returned
+    
+    Returns:
+        List of pages, in the same order as windows (empty if on_page is set)
+    """
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=60)
+    
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        if on_page is None:
+            return await asyncio.gather(*(
+                _fetch_page(session, semaphore, limit, offset, filters)
+                for offset, limit in windows
+            ))
+        
+        # Bound pages held in memory to FETCH_CONCURRENCY, and hand them to
+        # on_page one at a time in a worker thread
+        in_memory = asyncio.Semaphore(FETCH_CONCURRENCY)
+        hand_off = asyncio.Lock()
+        
+        async def fetch_and_hand_off(offset: int, limit: int) -> None:
+            async with in_memory:
+                page = await _fetch_page(session, semaphore, limit, offset, filters)
+                async with hand_off:
+                    await asyncio.to_thread(on_page, page)
+        
+        await asyncio.gather(*(
+            fetch_and_hand_off(offset, limit) for offset, limit in windows
+        ))
+        return []
+
+
+def _page_windows(filters: Dict = None, max_records: int = None) -> List[Tuple[int, int]]:
+    """
+    Split the matching records into (offset, limit) page windows
     
     Args:
         filters: Dictionary of filter parameters
         max_records: Maximum number of records to fetch (None for all)
     
     Returns:
-        List of all records
+        List of (offset, limit) pairs covering every record to fetch
     """
-    all_data = []
-    offset = 0
-    limit = 10000
+    total = fetch_brfss_count(filters=filters)
+    
+    if max_records and total > max_records:
+        total = max_records
+        logger.info("Limiting extraction to max_records: %s", max_records)
     
+    return [
+        (offset, min(PAGE_SIZE, total - offset))
+        for offset in range(0, total, PAGE_SIZE)
+    ]
+
+
+def fetch_all_brfss_data(filters: Dict = None, max_records: int = None) -> pa.Table:
+    """
+    Fetch all available BRFSS data with concurrent pagination
+    
+    The total record count is fetched first so that every page can be
+    requested at once, bounded by FETCH_CONCURRENCY.
+    
+    Args:
+        filters: Dictionary of filter parameters
+        max_records: Maximum number of records to fetch (None for all)
+    
+    Returns:
+        Arrow table of all records
+    """
     logger.info("Starting data extraction from CDC BRFSS API...")
     
-    while True:
-        data = fetch_brfss_data(limit=limit, offset=offset, filters=filters)
-        
-        if not data:
-            break
+    windows = _page_windows(filters=filters, max_records=max_records)
+    pages = asyncio.run(_fetch_pages(windows, filters=filters))
+    
+    if not pages:
+        return pa.table({})
+    
+    # Pages are returned in offset order, so records keep the API ordering.
+    # Every page shares one schema, so the batches assemble without copying.
+    batches = deque()
+    for page in pages:
+        batches.extend(page.to_batches())
+    table = pa.Table.from_batches(batches, schema=pages[0].schema)
+    
+    logger.info("Total records extracted: %s", table.num_rows)
+    return table
+
+
+def stream_brfss_to_gcs(
+    bucket_name: str,
+    blob_name: str,
+    project_id: str,
+    credentials_path: str = None,
+    filters: Dict = None,
+    max_records: int = None
+) -> Tuple[str, Dict]:
+    """
+    Stream all available BRFSS data into a Parquet file in GCS
+    
+    Each page is written as a row group as soon as it arrives, so peak memory
+    stays at a few pages instead of the whole dataset. Validation statistics
+    are accumulated along the way, since the data is never held in one frame.
+    
+    The file is written to a temporary object next to blob_name; the caller
+    moves it into place with publish_gcs_extract once the statistics pass
+    validation, or removes it with discard_gcs_extract.
+    
+    Args:
+        bucket_name: GCS bucket to stage the extract in
+        blob_name: Object name of the Parquet file
+        project_id: GCP project ID
+        credentials_path: Path to service account key file
+        filters: Dictionary of filter parameters
+        max_records: Maximum number of records to fetch (None for all)
+    
+    Returns:
+        Tuple of (gs:// URI of the temporary object, validation statistics as
+        from _compute_stats)
+    """
+    logger.info("Starting data extraction from CDC BRFSS API to GCS...")
+    
+    windows = _page_windows(filters=filters, max_records=max_records)
+    bucket = _get_storage_client(project_id, credentials_path).bucket(bucket_name)
+    schema_columns = [field.name for field in BIGQUERY_SCHEMA]
+    
+    # Write to a temporary object that is only renamed over blob_name once
+    # the file is complete and validated, so a failed or empty run never
+    # replaces a good staged file
+    temp_blob = bucket.blob(f"{blob_name}.{uuid.uuid4().hex}.tmp")
+    
+    stats = {'rows': 0, 'columns': [], 'null_counts': pd.Series(dtype="int64")}
+    writer = None
+    
+    # ParquetWriter flushes its sink, which GCS only supports on close
+    sink = temp_blob.open("wb", ignore_flush=True)
+    
+    def write_page(page: pa.Table) -> None:
+        nonlocal writer
         
-        all_data.extend(data)
+        # Upload only the columns the table schema defines
+        page = page.select([name for name in schema_columns if name in page.column_names])
         
-        if max_records and len(all_data) >= max_records:
-            all_data = all_data[:max_records]
-            logger.info(f"Reached max_records limit: {max_records}")
-            break
+        if writer is None:
+            writer = pq.ParquetWriter(sink, page.schema, compression="snappy")
+            stats['columns'] = page.column_names
+            stats['null_counts'] = pd.Series(0, index=page.column_names, dtype="int64")
         
-        if len(data) < limit:
-            break
+        writer.write_table(page)
+        page_stats = _compute_table_stats(page)
+        stats['rows'] += page_stats['rows']
+        stats['null_counts'] += page_stats['null_counts']
+    
+    try:
+        asyncio.run(_fetch_pages(windows, filters=filters, on_page=write_page))
         
-        offset += limit
+        if writer is not None:
+            writer.close()
+        sink.close()
+    except BaseException:
+        # Close explicitly rather than leaving it to garbage collection, which
+        # would finalize the upload at an unknown time, then drop the partial
+        # temporary object; blob_name itself is never touched
+        logger.error("Extraction to GCS failed; discarding %s", temp_blob.name)
+        try:
+            if writer is not None:
+                writer.close()
+            sink.close()
+            temp_blob.delete()
+        except Exception as cleanup_error:
+            logger.warning("Could not remove %s: %s", temp_blob.name, cleanup_error)
+        raise
+    
+    staged_uri = f"gs://{bucket_name}/{temp_blob.name}"
+    logger.info("Total records extracted: %s (staged at %s)", stats['rows'], staged_uri)
+    return staged_uri, stats
+
+
+def _split_gcs_uri(gcs_uri: str) -> Tuple[str, str]:
+    """
+    Split a gs:// URI into its bucket and object names
+    
+    Args:
+        gcs_uri: gs:// URI of an object
+    
+    Returns:
+        Tuple of (bucket_name, blob_name)
+    """
+    bucket_name, _, blob_name = gcs_uri[len("gs://"):].partition("/")
+    return bucket_name, blob_name
+
+
+def publish_gcs_extract(
+    staged_uri: str,
+    blob_name: str,
+    project_id: str,
+    credentials_path: str = None
+) -> str:
+    """
+    Move a validated extract from stream_brfss_to_gcs over blob_name
+    
+    Args:
+        staged_uri: gs:// URI of the temporary object
+        blob_name: Object name of the Parquet file to replace
+        project_id: GCP project ID
+        credentials_path: Path to service account key file
+    
+    Returns:
+        gs:// URI of the published Parquet file
+    """
+    bucket_name, temp_name = _split_gcs_uri(staged_uri)
+    bucket = _get_storage_client(project_id, credentials_path).bucket(bucket_name)
+    bucket.rename_blob(bucket.blob(temp_name), blob_name)
+    
+    gcs_uri = f"gs://{bucket_name}/{blob_name}"
+    logger.info("✓ Published extract to %s", gcs_uri)
+    return gcs_uri
+
+
+def discard_gcs_extract(staged_uri: str, project_id: str, credentials_path: str = None) -> None:
+    """
+    Delete an extract from stream_brfss_to_gcs that will not be published
+    
+    Failures are logged rather than raised, since this runs while another
+    error is already being handled.
     
-    logger.info(f"Total records extracted: {len(all_data)}")
-    return all_data
+    Args:
+        staged_uri: gs:// URI of the temporary object
+        project_id: GCP project ID
+        credentials_path: Path to service account key file
+    """
+    bucket_name, temp_name = _split_gcs_uri(staged_uri)
+    logger.info("Discarding unpublished extract %s", staged_uri)
+    try:
+        bucket = _get_storage_client(project_id, credentials_path).bucket(bucket_name)
+        bucket.blob(temp_name).delete()
+    except Exception as e:
+        logger.warning("Could not remove %s: %s", staged_uri, e)
 
 
-def validate_row_count(df: pd.DataFrame) -> None:
+def _coerce_dtypes(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Validate that the DataFrame has a minimum number of rows
+    Convert repeated strings to categoricals before validation and upload
+    
+    Numeric columns are already typed by _coerce_numeric_columns when each
+    page is parsed, so only this lossless string conversion is left.
+    
+    Args:
+        df: DataFrame as returned by fetch_all_brfss_data
+    
+    Returns:
+        DataFrame with categorical strings
+    """
+    present = set(df.columns)
+    converted = {}
+    
+    for column in CATEGORICAL_COLUMNS:
+        if column in present:
+            converted[column] = df[column].astype("category")
+    
+    return df.assign(**converted)
+
+
+def _compute_stats(df: pd.DataFrame) -> Dict:
+    """
+    Compute everything the validation checks need in a single pass
     
     Args:
         df: DataFrame to validate
     
+    Returns:
+        Dictionary with the row count, column names and per-column null counts
+    """
+    return {
+        'rows': len(df),
+        'columns': df.columns.tolist(),
+        'null_counts': df.isna().sum(),
+    }
+
+
+def _compute_table_stats(table: pa.Table) -> Dict:
+    """
+    Compute the validation statistics of an Arrow table from its metadata
+    
+    Arrow arrays carry their null count, so no column data is scanned.
+    
+    Args:
+        table: Arrow table to validate
+    
+    Returns:
+        Dictionary with the row count, column names and per-column null counts
+    """
+    return {
+        'rows': table.num_rows,
+        'columns': table.column_names,
+        'null_counts': pd.Series(
+            [table.column(index).null_count for index in range(table.num_columns)],
+            index=table.column_names,
+            dtype="int64"
+        ),
+    }
+
+
+def validate_row_count(stats: Dict) -> None:
+    """
+    Validate that the data has a minimum number of rows
+    
+    Args:
+        stats: Statistics from _compute_stats
+    
     Raises:
         ValidationError: If row count is below minimum
     """
-    row_count = len(df)
-    logger.info(f"Row count validation: {row_count} rows")
+    row_count = stats['rows']
+    logger.info("Row count validation: %s rows", row_count)
     
     if row_count < MIN_ROW_COUNT:
         raise ValidationError(
@@ -139,80 +670,78 @@ def validate_row_count(df: pd.DataFrame) -> None:
             f"(minimum required: {MIN_ROW_COUNT})"
         )
     
-    logger.info(f"✓ Row count validation passed: {row_count} rows")
+    logger.info("✓ Row count validation passed: %s rows", row_count)
 
 
-def validate_schema(df: pd.DataFrame) -> None:
+def validate_schema(stats: Dict) -> None:
     """
-    Validate that the DataFrame contains expected columns
+    Validate that the data contains expected columns
     
     Args:
-        df: DataFrame to validate
+        stats: Statistics from _compute_stats
     
     Raises:
         ValidationError: If expected columns are missing
     """
-    actual_columns = set(df.columns)
-    expected_columns = set(EXPECTED_COLUMNS)
+    columns = stats['columns']
     
-    logger.info(f"Schema validation: checking for expected columns...")
-    logger.info(f"Actual columns: {sorted(actual_columns)}")
+    logger.info("Schema validation: checking for expected columns...")
+    logger.debug("Actual columns: %s", columns)
     
-    # Check for missing expected columns (warnings only, not strict)
-    missing_columns = expected_columns - actual_columns
+    # Check for missing expected columns (warnings only, not strict). With the
+    # default $select a missing column already fails the fetch with HTTP 400,
+    # so this only fires when filters override $select.
+    missing_columns = EXPECTED_COLUMNS_SET.difference(columns)
     if missing_columns:
         logger.warning(
-            f"⚠ Some expected columns are missing: {sorted(missing_columns)}"
+            "⚠ Some expected columns are missing: %s", sorted(missing_columns)
         )
     
     # Ensure we have at least some columns
-    if len(actual_columns) == 0:
+    if len(columns) == 0:
         raise ValidationError("Schema validation failed: DataFrame has no columns")
     
-    logger.info(f"✓ Schema validation passed: {len(actual_columns)} columns present")
+    logger.info("✓ Schema validation passed: %s columns present", len(columns))
 
 
-def validate_null_checks(df: pd.DataFrame) -> None:
+def validate_null_checks(stats: Dict) -> None:
     """
-    Perform basic null value checks on the DataFrame
+    Perform basic null value checks on the data
     
     Args:
-        df: DataFrame to validate
+        stats: Statistics from _compute_stats
     
     Raises:
         ValidationError: If null percentage exceeds threshold for critical columns
     """
     logger.info("Null value validation: checking null percentages...")
     
-    null_report = []
-    critical_failures = []
+    null_counts = stats['null_counts']
+    null_percentages = null_counts * (100.0 / stats['rows'])
     
-    for column in df.columns:
-        null_count = df[column].isna().sum()
-        null_percentage = (null_count / len(df)) * 100
-        
-        null_report.append({
-            'column': column,
-            'null_count': null_count,
-            'null_percentage': round(null_percentage, 2)
-        })
-        
-        if null_percentage > MAX_NULL_PERCENTAGE:
-            critical_failures.append(
-                f"{column}: {null_percentage:.2f}% nulls (limit: {MAX_NULL_PERCENTAGE}%)"
-            )
+    null_df = pd.DataFrame({
+        'column': null_counts.index,
+        'null_count': null_counts.values,
+        'null_percentage': null_percentages.round(2).values
+    }).sort_values('null_percentage', ascending=False)
+    
+    high_nulls = null_percentages[null_percentages > MAX_NULL_PERCENTAGE]
+    critical_failures = [
+        f"{column}: {null_percentage:.2f}% nulls (limit: {MAX_NULL_PERCENTAGE}%)"
+        for column, null_percentage in high_nulls.items()
+    ]
     
-    # Log null report
-    null_df = pd.DataFrame(null_report).sort_values('null_percentage', ascending=False)
-    logger.info(f"\nNull Value Report:\n{null_df.to_string(index=False)}")
+    # Log null report (to_string renders every row, so skip it when INFO is off)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\nNull Value Report:\n%s", null_df.to_string(index=False))
     
     # Check for critical failures
     if critical_failures:
         logger.warning(
-            f"⚠ High null percentages detected:\n" + "\n".join(critical_failures)
+            "⚠ High null percentages detected:\n%s", "\n".join(critical_failures)
         )
     else:
-        logger.info(f"✓ Null validation passed: All columns within acceptable limits")
+        logger.info("✓ Null validation passed: All columns within acceptable limits")
 
 
 def validate_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
@@ -222,6 +751,20 @@ def validate_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
     Args:
         df: DataFrame to validate
     
+    Returns:
+        Tuple of (validation_passed, list_of_warnings)
+    """
+    return validate_stats(_compute_stats(df))
+
+
+def validate_stats(stats: Dict) -> Tuple[bool, List[str]]:
+    """
+    Run all validation checks on precomputed statistics
+    
+    Args:
+        stats: Statistics from _compute_stats, _compute_table_stats or
+            stream_brfss_to_gcs
+    
     Returns:
         Tuple of (validation_passed, list_of_warnings)
     """
@@ -232,10 +775,10 @@ def validate_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
     warnings = []
     
     try:
-        # Run validation checks
-        validate_row_count(df)
-        validate_schema(df)
-        validate_null_checks(df)
+        # Run validation checks against statistics gathered in one pass
+        validate_row_count(stats)
+        validate_schema(stats)
+        validate_null_checks(stats)
         
         logger.info("\n" + "="*60)
         logger.info("✓ ALL VALIDATION CHECKS PASSED")
@@ -244,11 +787,256 @@ def validate_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
         return True, warnings
         
     except ValidationError as e:
-        logger.error(f"\n✗ VALIDATION FAILED: {e}")
+        logger.error("\n✗ VALIDATION FAILED: %s", e)
         logger.info("="*60 + "\n")
         return False, [str(e)]
 
 
+# Datasets known to exist, so each one is only looked up once per process
+_EXISTING_DATASETS = set()
+
+
+@functools.lru_cache(maxsize=4)
+def _load_credentials(credentials_path: str) -> service_account.Credentials:
+    """
+    Load service account credentials, reused across calls with the same path
+    
+    Args:
+        credentials_path: Path to service account key file
+    
+    Returns:
+        Service account credentials
+    """
+    return service_account.Credentials.from_service_account_file(
+        credentials_path,
+        scopes=["https://www.googleapis.com/auth/cloud-platform"]
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _get_client(project_id: str, credentials_path: str = None) -> bigquery.Client:
+    """
+    Create a BigQuery client, reused across calls with the same arguments
+    
+    Args:
+        project_id: GCP project ID
+        credentials_path: Path to service account key file
+    
+    Returns:
+        BigQuery client
+    """
+    if credentials_path:
+        credentials = _load_credentials(credentials_path)
+        return bigquery.Client(credentials=credentials, project=project_id)
+    
+    return bigquery.Client(project=project_id)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_storage_client(project_id: str, credentials_path: str = None) -> storage.Client:
+    """
+    Create a GCS client, reused across calls with the same arguments
+    
+    Args:
+        project_id: GCP project ID
+        credentials_path: Path to service account key file
+    
+    Returns:
+        GCS client
+    """
+    if credentials_path:
+        credentials = _load_credentials(credentials_path)
+        return storage.Client(credentials=credentials, project=project_id)
+    
+    return storage.Client(project=project_id)
+
+
+def _ensure_dataset(client: bigquery.Client, dataset_ref: str) -> None:
+    """
+    Create the dataset if it doesn't exist
+    
+    Args:
+        client: BigQuery client
+        dataset_ref: Fully qualified BigQuery dataset ID
+    """
+    if dataset_ref in _EXISTING_DATASETS:
+        return
+    
+    try:
+        client.get_dataset(dataset_ref)
+        logger.info("Dataset %s already exists", dataset_ref)
+    except Exception:
+        dataset = bigquery.Dataset(dataset_ref)
+        dataset.location = "US"
+        client.create_dataset(dataset)
+        logger.info("Created dataset: %s", dataset_ref)
+    
+    _EXISTING_DATASETS.add(dataset_ref)
+
+
+def _load_job_config(write_disposition: str) -> bigquery.LoadJobConfig:
+    """
+    Build the load job configuration shared by every load path
+    
+    Args:
+        write_disposition: BigQuery write disposition for the load job
+    
+    Returns:
+        BigQuery load job configuration
+    """
+    # Fix the table schema up front instead of deriving it from the file, and
+    # partition by year / cluster by common filters so queries scan less
+    return bigquery.LoadJobConfig(
+        schema=BIGQUERY_SCHEMA,
+        source_format=bigquery.SourceFormat.PARQUET,
+        write_disposition=write_disposition,
+        range_partitioning=_range_partitioning(),
+        clustering_fields=CLUSTERING_FIELDS,
+    )
+
+
+def _range_partitioning() -> bigquery.RangePartitioning:
+    """
+    Build the integer range partitioning on year used by the raw table
+    
+    Returns:
+        BigQuery range partitioning specification
+    """
+    start, end, interval = PARTITION_YEAR_RANGE
+    return bigquery.RangePartitioning(
+        field="year",
+        range_=bigquery.PartitionRange(start=start, end=end, interval=interval),
+    )
+
+
+def _table_layout_differs(client: bigquery.Client, table_ref: str) -> bool:
+    """
+    Check whether an existing table's partitioning or clustering differs
+    
+    BigQuery rejects a WRITE_TRUNCATE copy whose partitioning spec differs
+    from the existing table, e.g. one created unpartitioned by hand, so such
+    a table has to be dropped and recreated instead.
+    
+    Args:
+        client: BigQuery client
+        table_ref: Fully qualified BigQuery table ID
+    
+    Returns:
+        True if the table exists with a different layout
+    """
+    try:
+        table = client.get_table(table_ref)
+    except NotFound:
+        return False
+    
+    expected = _range_partitioning()
+    actual = table.range_partitioning
+    same_partitioning = (
+        actual is not None
+        and actual.field == expected.field
+        and (actual.range_.start, actual.range_.end, actual.range_.interval)
+        == (expected.range_.start, expected.range_.end, expected.range_.interval)
+    )
+    same_clustering = list(table.clustering_fields or []) == CLUSTERING_FIELDS
+    
+    return not (same_partitioning and same_clustering)
+
+
+def _create_staging_table(client: bigquery.Client, table_ref: str) -> str:
+    """
+    Create an empty staging table laid out like the target table
+    
+    The name is unique per run so that overlapping runs never delete or copy
+    each other's staging table.
+    
+    Args:
+        client: BigQuery client
+        table_ref: Fully qualified BigQuery table ID of the target
+    
+    Returns:
+        Fully qualified BigQuery table ID of the staging table
+    """
+    staging_ref = f"{table_ref}{STAGING_TABLE_SUFFIX}_{uuid.uuid4().hex}"
+    staging_table = bigquery.Table(staging_ref, schema=BIGQUERY_SCHEMA)
+    staging_table.range_partitioning = _range_partitioning()
+    staging_table.clustering_fields = CLUSTERING_FIELDS
+    
+    client.create_table(staging_table)
+    return staging_ref
+
+
+def _replace_from_staging(client: bigquery.Client, staging_ref: str, table_ref: str) -> None:
+    """
+    Replace the target table with a fully loaded staging table
+    
+    A target with a different layout cannot be overwritten in place, so it is
+    backed up and dropped first, and restored from the backup if the copy
+    fails; either way a failed run leaves the previous table in place.
+    
+    Args:
+        client: BigQuery client
+        staging_ref: Fully qualified BigQuery table ID of the staging table
+        table_ref: Fully qualified BigQuery table ID of the target
+    """
+    copy_config = bigquery.CopyJobConfig(
+        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
+    )
+    
+    if not _table_layout_differs(client, table_ref):
+        client.copy_table(staging_ref, table_ref, job_config=copy_config).result()
+        return
+    
+    logger.warning(
+        "⚠ %s has a different partitioning/clustering layout; recreating it",
+        table_ref
+    )
+    backup_ref = f"{table_ref}__backup_{uuid.uuid4().hex}"
+    client.copy_table(table_ref, backup_ref).result()
+    client.delete_table(table_ref)
+    
+    try:
+        client.copy_table(staging_ref, table_ref, job_config=copy_config).result()
+    except Exception:
+        logger.error("Replacing %s failed; restoring the previous table", table_ref)
+        client.copy_table(backup_ref, table_ref).result()
+        raise
+    finally:
+        client.delete_table(backup_ref, not_found_ok=True)
+
+
+def _load_chunk(
+    client: bigquery.Client,
+    chunk: pd.DataFrame,
+    table_ref: str,
+    write_disposition: str
+) -> bigquery.LoadJob:
+    """
+    Load one DataFrame chunk into BigQuery as Parquet and wait for it
+    
+    Args:
+        client: BigQuery client
+        chunk: DataFrame chunk to load
+        table_ref: Fully qualified BigQuery table ID
+        write_disposition: BigQuery write disposition for the load job
+    
+    Returns:
+        Completed BigQuery load job
+    """
+    job_config = _load_job_config(write_disposition)
+    
+    # Upload only the columns the table schema defines
+    chunk = chunk[[field.name for field in BIGQUERY_SCHEMA if field.name in chunk.columns]]
+    
+    # Serialize once to compressed Parquet and upload the bytes directly
+    buffer = io.BytesIO()
+    chunk.to_parquet(buffer, engine="pyarrow", compression="snappy", index=False)
+    buffer.seek(0)
+    
+    job = client.load_table_from_file(buffer, table_ref, job_config=job_config)
+    job.result()  # Wait for job to complete
+    return job
+
+
 def load_to_bigquery(
     df: pd.DataFrame, 
     project_id: str, 
@@ -273,44 +1061,102 @@ def load_to_bigquery(
     logger.info("LOADING DATA TO BIGQUERY")
     logger.info("="*60)
     
-    # Initialize BigQuery client
-    if credentials_path:
-        credentials = service_account.Credentials.from_service_account_file(
-            credentials_path,
-            scopes=["https://www.googleapis.com/auth/cloud-platform"]
-        )
-        client = bigquery.Client(credentials=credentials, project=project_id)
-    else:
-        client = bigquery.Client(project=project_id)
+    # Initialize BigQuery client (cached per project and credentials)
+    client = _get_client(project_id, credentials_path)
     
     # Create dataset if it doesn't exist
-    dataset_ref = f"{project_id}.{dataset_id}"
+    _ensure_dataset(client, f"{project_id}.{dataset_id}")
+    
+    # Define table reference
+    table_ref = f"{project_id}.{dataset_id}.{table_id}"
+    
+    logger.info("Loading %s rows to %s...", len(df), table_ref)
+    
+    # Split into LOAD_CONCURRENCY chunks so uploads run over parallel streams
+    chunk_size = max(1, math.ceil(len(df) / LOAD_CONCURRENCY))
+    chunks = [df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)] or [df]
+    
+    # Chunks are appended to an empty staging table, which then replaces the
+    # target in one copy job, so a failed chunk never leaves the target
+    # truncated or partially loaded
+    staging_ref = _create_staging_table(client, table_ref)
+    
     try:
-        client.get_dataset(dataset_ref)
-        logger.info(f"Dataset {dataset_ref} already exists")
-    except Exception:
-        dataset = bigquery.Dataset(dataset_ref)
-        dataset.location = "US"
-        client.create_dataset(dataset)
-        logger.info(f"Created dataset: {dataset_ref}")
+        with ThreadPoolExecutor(max_workers=LOAD_CONCURRENCY) as executor:
+            futures = [
+                executor.submit(
+                    _load_chunk, client, chunk, staging_ref, bigquery.WriteDisposition.WRITE_APPEND
+                )
+                for chunk in chunks
+            ]
+            for future in futures:
+                future.result()
+        
+        _replace_from_staging(client, staging_ref, table_ref)
+    finally:
+        client.delete_table(staging_ref, not_found_ok=True)
+    
+    table = client.get_table(table_ref)
+    logger.info("✓ Successfully loaded %s rows to %s", table.num_rows, table_ref)
+    logger.info("="*60 + "\n")
+    
+    return table
+
+
+def load_gcs_to_bigquery(
+    gcs_uri: str,
+    project_id: str,
+    dataset_id: str,
+    table_id: str,
+    credentials_path: str = None
+) -> bigquery.Table:
+    """
+    Load a Parquet file staged in GCS into BigQuery as a raw table
+    
+    Args:
+        gcs_uri: gs:// URI of the staged Parquet file
+        project_id: GCP project ID
+        dataset_id: BigQuery dataset ID
+        table_id: BigQuery table ID
+        credentials_path: Path to service account key file
+    
+    Returns:
+        BigQuery Table object
+    """
+    logger.info("\n" + "="*60)
+    logger.info("LOADING DATA TO BIGQUERY")
+    logger.info("="*60)
+    
+    # Initialize BigQuery client (cached per project and credentials)
+    client = _get_client(project_id, credentials_path)
+    
+    # Create dataset if it doesn't exist
+    _ensure_dataset(client, f"{project_id}.{dataset_id}")
     
     # Define table reference
     table_ref = f"{project_id}.{dataset_id}.{table_id}"
     
-    # Configure load job
-    job_config = bigquery.LoadJobConfig(
-        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
-        autodetect=True,
-    )
+    logger.info("Loading %s to %s...", gcs_uri, table_ref)
     
-    logger.info(f"Loading {len(df)} rows to {table_ref}...")
+    # BigQuery reads the file directly from GCS in a single load job into a
+    # staging table, which then replaces the target, so a failed load never
+    # leaves the target missing or truncated
+    staging_ref = _create_staging_table(client, table_ref)
     
-    # Load data
-    job = client.load_table_from_dataframe(df, table_ref, job_config=job_config)
-    job.result()  # Wait for job to complete
+    try:
+        job = client.load_table_from_uri(
+            gcs_uri,
+            staging_ref,
+            job_config=_load_job_config(bigquery.WriteDisposition.WRITE_APPEND)
+        )
+        job.result()  # Wait for job to complete
+        
+        _replace_from_staging(client, staging_ref, table_ref)
+    finally:
+        client.delete_table(staging_ref, not_found_ok=True)
     
     table = client.get_table(table_ref)
-    logger.info(f"✓ Successfully loaded {table.num_rows} rows to {table_ref}")
+    logger.info("✓ Successfully loaded %s rows to %s", table.num_rows, table_ref)
     logger.info("="*60 + "\n")
     
     return table
@@ -324,9 +1170,12 @@ def main():
     
     logger.info("\n" + "="*60)
     logger.info("CDC BRFSS MENTAL HEALTH DATA INGESTION PIPELINE")
-    logger.info(f"Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("Started at: %s", start_time.strftime('%Y-%m-%d %H:%M:%S'))
     logger.info("="*60 + "\n")
     
+    # Temporary GCS extract that has not been published yet
+    staged_uri = None
+    
     try:
         # Step 1: Extract data from CDC API
         logger.info("STEP 1: EXTRACTING DATA FROM CDC API")
@@ -337,38 +1186,78 @@ def main():
             # '$where': "topic='Mental Health'"
         }
         
-        data = fetch_all_brfss_data(filters=filters, max_records=None)
+        credentials_path = SERVICE_ACCOUNT_KEY if SERVICE_ACCOUNT_KEY != "path/to/your-service-account-key.json" else None
+        
+        if GCS_BUCKET:
+            # Stream pages to GCS so the full dataset is never held in memory
+            staged_uri, stats = stream_brfss_to_gcs(
+                bucket_name=GCS_BUCKET,
+                blob_name=GCS_BLOB_NAME,
+                project_id=PROJECT_ID,
+                credentials_path=credentials_path,
+                filters=filters,
+                max_records=None
+            )
+            row_count = stats['rows']
+        else:
+            arrow_table = fetch_all_brfss_data(filters=filters, max_records=None)
+            
+            # Read validation statistics from Arrow metadata before converting;
+            # the categorical conversion below does not change null counts
+            stats = _compute_table_stats(arrow_table)
+            row_count = stats['rows']
         
-        if not data:
+        if row_count == 0:
             logger.error("No data fetched from CDC API. Exiting.")
             sys.exit(1)
         
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
-        logger.info(f"Data shape: {df.shape}")
-        logger.info(f"Columns: {df.columns.tolist()}\n")
+        if not GCS_BUCKET:
+            # Convert to an Arrow-backed DataFrame, reusing the Arrow buffers
+            df = arrow_table.to_pandas(types_mapper=pd.ArrowDtype)
+            df = _coerce_dtypes(df)
+            logger.info("Data shape: %s", df.shape)
+            logger.info("Columns: %s\n", df.columns.tolist())
         
         # Step 2: Validate data
         logger.info("STEP 2: VALIDATING DATA")
         logger.info("-"*60)
         
-        validation_passed, warnings = validate_data(df)
+        validation_passed, warnings = validate_stats(stats)
         
         if not validation_passed:
             logger.error("Data validation failed. Exiting.")
             sys.exit(1)
         
+        if GCS_BUCKET:
+            # Only a validated extract replaces the previously staged file
+            gcs_uri = publish_gcs_extract(
+                staged_uri,
+                blob_name=GCS_BLOB_NAME,
+                project_id=PROJECT_ID,
+                credentials_path=credentials_path
+            )
+            staged_uri = None
+        
         # Step 3: Load to BigQuery
         logger.info("STEP 3: LOADING TO BIGQUERY")
         logger.info("-"*60)
         
-        table = load_to_bigquery(
-            df=df,
-            project_id=PROJECT_ID,
-            dataset_id=DATASET_ID,
-            table_id=TABLE_ID,
-            credentials_path=SERVICE_ACCOUNT_KEY if SERVICE_ACCOUNT_KEY != "path/to/your-service-account-key.json" else None
-        )
+        if GCS_BUCKET:
+            table = load_gcs_to_bigquery(
+                gcs_uri=gcs_uri,
+                project_id=PROJECT_ID,
+                dataset_id=DATASET_ID,
+                table_id=TABLE_ID,
+                credentials_path=credentials_path
+            )
+        else:
+            table = load_to_bigquery(
+                df=df,
+                project_id=PROJECT_ID,
+                dataset_id=DATASET_ID,
+                table_id=TABLE_ID,
+                credentials_path=credentials_path
+            )
         
         # Summary
         end_time = datetime.now()
@@ -377,15 +1266,19 @@ def main():
         logger.info("="*60)
         logger.info("✓ PIPELINE COMPLETED SUCCESSFULLY")
         logger.info("="*60)
-        logger.info(f"Total rows processed: {len(df)}")
-        logger.info(f"BigQuery table: {table.project}.{table.dataset_id}.{table.table_id}")
-        logger.info(f"Duration: {duration:.2f} seconds")
-        logger.info(f"Completed at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("Total rows processed: %s", row_count)
+        logger.info("BigQuery table: %s.%s.%s", table.project, table.dataset_id, table.table_id)
+        logger.info("Duration: %.2f seconds", duration)
+        logger.info("Completed at: %s", end_time.strftime('%Y-%m-%d %H:%M:%S'))
         logger.info("="*60 + "\n")
         
     except Exception as e:
-        logger.error(f"\n✗ PIPELINE FAILED: {e}", exc_info=True)
+        logger.error("\n✗ PIPELINE FAILED: %s", e, exc_info=True)
         sys.exit(1)
+    finally:
+        # Runs on sys.exit too, so an empty or invalid extract is never left behind
+        if staged_uri:
+            discard_gcs_extract(staged_uri, PROJECT_ID, credentials_path)
 
 
 if __name__ == "__main__":
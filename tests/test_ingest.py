@@ -0,0 +1,504 @@
+"""
+Tests for the CDC BRFSS ingestion pipeline
+"""
+
+import asyncio
+import io
+from types import SimpleNamespace
+
+import aiohttp
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from google.api_core.exceptions import NotFound
+
+import ingest
+
+
+HEADER = '"year","locationabbr","locationdesc","class","topic","question","data_value","sample_size"'
+
+
+def make_csv(offset: int, limit: int) -> bytes:
+    """Build a CSV page body like the CDC export returns"""
+    rows = [
+        f'"{2011 + i % 10}","AL","Alabama","Health Status","Depression","Q?","{i}.4","{100 + i}"'
+        for i in range(offset, offset + limit)
+    ]
+    return ("\n".join([HEADER] + rows) + "\n").encode()
+
+
+def run_against_server(handler, coroutine_factory):
+    """Serve handler locally and run the coroutine against it"""
+    async def run():
+        app = web.Application()
+        app.router.add_get("/resource.csv", handler)
+        async with TestServer(app) as server:
+            ingest.CDC_API_BASE = str(server.make_url("/resource.csv"))
+            return await coroutine_factory()
+    
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    """Skip backoff sleeps and restore CDC_API_BASE after each test"""
+    monkeypatch.setattr(ingest, "CDC_API_BASE", ingest.CDC_API_BASE)
+    monkeypatch.setattr(ingest, "RETRY_BACKOFF_FACTOR", 0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_client_caches():
+    """Start and end each test without cached clients or known datasets"""
+    get_client = ingest._get_client
+    get_client.cache_clear()
+    ingest._EXISTING_DATASETS.clear()
+    yield
+    get_client.cache_clear()
+    ingest._EXISTING_DATASETS.clear()
+
+
+def test_fetch_pages_retries_throttled_page():
+    attempts = {}
+    
+    async def handler(request):
+        offset = int(request.query["$offset"])
+        limit = int(request.query["$limit"])
+        attempts[offset] = attempts.get(offset, 0) + 1
+        if offset == 20 and attempts[offset] == 1:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        if offset == 10 and attempts[offset] == 1:
+            return web.Response(status=503)
+        return web.Response(body=make_csv(offset, limit), content_type="text/csv")
+    
+    windows = [(0, 10), (10, 10), (20, 5)]
+    pages = run_against_server(handler, lambda: ingest._fetch_pages(windows))
+    
+    assert [page.num_rows for page in pages] == [10, 10, 5]
+    assert attempts == {0: 1, 10: 2, 20: 2}
+
+
+def test_fetch_pages_gives_up_after_retry_total(monkeypatch):
+    monkeypatch.setattr(ingest, "RETRY_TOTAL", 2)
+    attempts = []
+    
+    async def handler(request):
+        attempts.append(request.query["$offset"])
+        return web.Response(status=429)
+    
+    with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+        run_against_server(handler, lambda: ingest._fetch_pages([(0, 10)]))
+    
+    assert excinfo.value.status == 429
+    assert len(attempts) == 3
+
+
+def test_retry_delay_honours_retry_after():
+    assert ingest._retry_delay(0, "3") == 3.0
+    assert ingest._retry_delay(0, "Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert ingest._retry_delay(2) == ingest.RETRY_BACKOFF_FACTOR * 4
+
+
+class FakeJob:
+    def __init__(self, error: Exception = None):
+        self.error = error
+    
+    def result(self):
+        if self.error:
+            raise self.error
+        return self
+
+
+class FakeBigQueryClient:
+    """Records the BigQuery calls made by the load functions"""
+    
+    def __init__(self, fail_chunk: int = None, fail_job: str = None, existing: dict = None):
+        self.fail_chunk = fail_chunk
+        self.fail_job = fail_job
+        self.existing = dict(existing or {})
+        self.calls = []
+        self.loaded_rows = []
+        self.dataset_lookups = 0
+    
+    def get_dataset(self, dataset_ref):
+        self.dataset_lookups += 1
+        return dataset_ref
+    
+    def delete_table(self, table_ref, not_found_ok=False):
+        self.calls.append(("delete", table_ref))
+        self.existing.pop(table_ref, None)
+    
+    def create_table(self, table):
+        table_ref = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        self.calls.append(("create", table_ref))
+        self.existing[table_ref] = existing_table()
+        return table
+    
+    def load_table_from_file(self, buffer, table_ref, job_config):
+        rows = pq.read_table(buffer).num_rows
+        self.calls.append(("load", table_ref, job_config.write_disposition))
+        self.loaded_rows.append(rows)
+        if self.fail_chunk is not None and len(self.loaded_rows) == self.fail_chunk + 1:
+            return FakeJob(RuntimeError("load failed"))
+        self.existing[table_ref].num_rows += rows
+        return FakeJob()
+    
+    def get_table(self, table_ref):
+        if table_ref not in self.existing:
+            raise NotFound(table_ref)
+        return self.existing[table_ref]
+    
+    def copy_table(self, source, destination, job_config=None):
+        write_disposition = job_config.write_disposition if job_config else None
+        self.calls.append(("copy", source, destination, write_disposition))
+        if self.fail_job == "copy" and "__staging_" in source:
+            return FakeJob(RuntimeError("copy failed"))
+        self.existing[destination] = self.existing[source]
+        return FakeJob()
+    
+    def load_table_from_uri(self, uri, table_ref, job_config):
+        self.calls.append(("load_uri", uri, table_ref, job_config.write_disposition))
+        if self.fail_job == "load_uri":
+            return FakeJob(RuntimeError("load failed"))
+        self.existing[table_ref].num_rows += 25
+        return FakeJob()
+
+
+def existing_table(partitioned: bool = True, num_rows: int = 0):
+    """Build a table as returned by get_table"""
+    return SimpleNamespace(
+        num_rows=num_rows,
+        project="p",
+        dataset_id="d",
+        table_id="t",
+        range_partitioning=ingest._range_partitioning() if partitioned else None,
+        clustering_fields=ingest.CLUSTERING_FIELDS if partitioned else None,
+    )
+
+
+def staging_table_ref(client):
+    """Return the staging table the client was asked to create"""
+    return next(call[1] for call in client.calls if call[0] == "create")
+
+
+@pytest.fixture
+def brfss_df():
+    table = ingest._parse_csv_page(make_csv(0, 10))
+    return ingest._coerce_dtypes(table.to_pandas(types_mapper=pd.ArrowDtype))
+
+
+def test_load_to_bigquery_swaps_in_staging_table(monkeypatch, brfss_df):
+    client = FakeBigQueryClient()
+    monkeypatch.setattr(ingest, "_get_client", lambda project_id, credentials_path: client)
+    
+    ingest.load_to_bigquery(brfss_df, "p", "d", "t")
+    
+    staging_ref = staging_table_ref(client)
+    loads = [call for call in client.calls if call[0] == "load"]
+    assert staging_ref.startswith("p.d.t__staging_")
+    assert sorted(client.loaded_rows) == [1, 3, 3, 3]
+    assert all(call[1:] == (staging_ref, "WRITE_APPEND") for call in loads)
+    assert ("copy", staging_ref, "p.d.t", "WRITE_TRUNCATE") in client.calls
+    assert client.calls[-1] == ("delete", staging_ref)
+
+
+def test_load_to_bigquery_uses_a_staging_table_per_run(monkeypatch, brfss_df):
+    first, second = FakeBigQueryClient(), FakeBigQueryClient()
+    clients = iter([first, second])
+    monkeypatch.setattr(ingest, "_get_client", lambda project_id, credentials_path: next(clients))
+    
+    ingest.load_to_bigquery(brfss_df, "p", "d", "t")
+    ingest.load_to_bigquery(brfss_df, "p", "d", "t")
+    
+    assert staging_table_ref(first) != staging_table_ref(second)
+    assert not any(call[0] == "delete" and call[1] == staging_table_ref(second) for call in first.calls)
+
+
+def test_load_to_bigquery_reuses_client_and_known_dataset(monkeypatch, brfss_df):
+    clients = []
+    
+    def make_client(project):
+        clients.append(FakeBigQueryClient())
+        return clients[-1]
+    
+    monkeypatch.setattr(ingest.bigquery, "Client", make_client)
+    
+    ingest.load_to_bigquery(brfss_df, "p", "d", "t")
+    ingest.load_to_bigquery(brfss_df, "p", "d", "t")
+    
+    assert len(clients) == 1
+    assert clients[0].dataset_lookups == 1
+    assert sum(call[0] == "copy" for call in clients[0].calls) == 2
+
+
+def test_load_to_bigquery_leaves_target_untouched_on_failure(monkeypatch, brfss_df):
+    client = FakeBigQueryClient(fail_chunk=1)
+    monkeypatch.setattr(ingest, "_get_client", lambda project_id, credentials_path: client)
+    
+    with pytest.raises(RuntimeError):
+        ingest.load_to_bigquery(brfss_df, "p", "d", "t")
+    
+    assert not any(call[0] == "copy" for call in client.calls)
+    assert all(call[1] != "p.d.t" for call in client.calls if call[0] in ("load", "delete"))
+    assert client.calls[-1] == ("delete", staging_table_ref(client))
+
+
+def test_parse_csv_page_keeps_float_values_exact():
+    table = ingest._parse_csv_page(b'"data_value","year"\n"23.4","2011"\n')
+    buffer = io.BytesIO()
+    ingest._coerce_dtypes(table.to_pandas(types_mapper=pd.ArrowDtype)).to_parquet(buffer, index=False)
+    buffer.seek(0)
+    
+    assert pq.read_table(buffer).column("data_value").to_pylist() == [23.4]
+
+
+def test_parse_csv_page_nulls_malformed_numbers():
+    body = (
+        b'"year","data_value","sample_size","topic"\n'
+        b'"2011","1.5","12","A"\n'
+        b'"20x1","n/a","12.5","B"\n'
+        b'" 2013 ",".5","99999999999",\n'
+    )
+    
+    table = ingest._parse_csv_page(body)
+    
+    assert table.schema.field("year").type == pa.int32()
+    assert table.schema.field("data_value").type == pa.float64()
+    assert table.column("year").to_pylist() == [2011, None, 2013]
+    assert table.column("data_value").to_pylist() == [1.5, None, 0.5]
+    assert table.column("sample_size").to_pylist() == [12, None, None]
+    assert table.column("topic").to_pylist() == ["A", "B", None]
+
+
+def test_fetch_pages_reports_rejected_select():
+    async def handler(request):
+        return web.Response(status=400, text='{"message": "No such column: sample_size"}')
+    
+    with pytest.raises(ValueError, match="No such column: sample_size"):
+        run_against_server(handler, lambda: ingest._fetch_pages([(0, 10)]))
+
+
+@pytest.mark.parametrize("filters, expected", [
+    (None, {"$select": ",".join(ingest.EXPECTED_COLUMNS), "$order": ":id"}),
+    (
+        {"$select": "year,topic", "$order": "year", "$where": "topic='Depression'"},
+        {"$select": "year,topic", "$order": "year", "$where": "topic='Depression'"},
+    ),
+])
+def test_fetch_pages_sends_page_params(filters, expected):
+    queries = []
+    
+    async def handler(request):
+        queries.append(dict(request.query))
+        return web.Response(body=make_csv(0, 5), content_type="text/csv")
+    
+    run_against_server(handler, lambda: ingest._fetch_pages([(20, 5)], filters=filters))
+    
+    assert queries == [{**expected, "$limit": "5", "$offset": "20"}]
+
+
+def test_fetch_brfss_count_keeps_only_row_filters(monkeypatch):
+    requests_made = []
+    
+    def get(url, params, timeout):
+        requests_made.append(params)
+        return SimpleNamespace(content=b'"count"\n"42"\n', raise_for_status=lambda: None)
+    
+    monkeypatch.setattr(ingest._SESSION, "get", get)
+    filters = {
+        "$select": "year", "$order": "year", "$limit": 5, "$offset": 10,
+        "$where": "topic='Depression'",
+    }
+    
+    assert ingest.fetch_brfss_count(filters) == 42
+    assert requests_made == [{"$where": "topic='Depression'", "$select": "count(*)"}]
+    assert filters["$select"] == "year"  # the caller's filters are not modified
+
+
+def test_table_stats_match_dataframe_nulls():
+    table = ingest._parse_csv_page(b'"year","topic"\n"2011",\n"x","A"\n,"B"\n')
+    
+    stats = ingest._compute_table_stats(table)
+    
+    assert stats['rows'] == 3
+    assert stats['columns'] == ["year", "topic"]
+    assert stats['null_counts'].to_dict() == {"year": 2, "topic": 1}
+    assert stats['null_counts'].equals(table.to_pandas(types_mapper=pd.ArrowDtype).isna().sum())
+
+
+def test_validate_data_flags_high_null_columns(caplog):
+    df = pd.DataFrame({"year": [2011] * 100, "topic": [None] * 60 + ["A"] * 40})
+    
+    passed, warnings = ingest.validate_data(df)
+    
+    assert (passed, warnings) == (True, [])
+    assert "topic: 60.00% nulls" in caplog.text
+
+
+class FakeBlobWriter(io.BytesIO):
+    """In-memory stand-in for a GCS BlobWriter that commits on close"""
+    
+    def __init__(self, bucket, name):
+        super().__init__()
+        self.bucket = bucket
+        self.name = name
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        if not self.closed:
+            self.bucket.objects[self.name] = self.getvalue()
+        super().close()
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+    
+    def open(self, mode, ignore_flush=False):
+        assert mode == "wb" and ignore_flush
+        return FakeBlobWriter(self.bucket, self.name)
+    
+    def delete(self):
+        del self.bucket.objects[self.name]
+
+
+class FakeBucket:
+    def __init__(self, objects=None):
+        self.objects = dict(objects or {})
+    
+    def blob(self, name):
+        return FakeBlob(self, name)
+    
+    def rename_blob(self, blob, new_name):
+        self.objects[new_name] = self.objects.pop(blob.name)
+
+
+@pytest.fixture
+def fake_bucket(monkeypatch):
+    bucket = FakeBucket({"brfss.parquet": b"previous good file"})
+    client = SimpleNamespace(bucket=lambda name: bucket)
+    monkeypatch.setattr(ingest, "_get_storage_client", lambda project_id, credentials_path: client)
+    monkeypatch.setattr(ingest, "fetch_brfss_count", lambda filters=None: 25)
+    monkeypatch.setattr(ingest, "PAGE_SIZE", 10)
+    return bucket
+
+
+def fake_fetch_page(fail_offset=None):
+    async def fetch(session, semaphore, limit, offset, filters):
+        # Finish out of order so pages reach the writer in completion order
+        await asyncio.sleep(0.001 * (30 - offset))
+        if offset == fail_offset:
+            raise aiohttp.ClientConnectionError("connection reset")
+        body = make_csv(offset, limit)
+        if offset == 10:
+            body = body.replace(b'"Alabama"', b'')
+        return ingest._parse_csv_page(body)
+    
+    return fetch
+
+
+def test_stream_brfss_to_gcs_writes_row_groups_and_stats(monkeypatch, fake_bucket):
+    monkeypatch.setattr(ingest, "_fetch_page", fake_fetch_page())
+    
+    staged_uri, stats = ingest.stream_brfss_to_gcs("bucket", "brfss.parquet", "p")
+    
+    temp_name = staged_uri[len("gs://bucket/"):]
+    assert temp_name.startswith("brfss.parquet.") and temp_name.endswith(".tmp")
+    assert fake_bucket.objects["brfss.parquet"] == b"previous good file"
+    
+    parquet_file = pq.ParquetFile(io.BytesIO(fake_bucket.objects[temp_name]))
+    assert parquet_file.metadata.num_rows == 25
+    assert parquet_file.num_row_groups == 3
+    assert parquet_file.schema_arrow.names == [field.name for field in ingest.BIGQUERY_SCHEMA]
+    
+    assert stats['rows'] == 25
+    assert stats['null_counts']['locationdesc'] == 10
+    assert stats['null_counts'].drop('locationdesc').sum() == 0
+    assert ingest.validate_stats(stats)[0] is False  # below MIN_ROW_COUNT
+    
+    assert ingest.publish_gcs_extract(staged_uri, "brfss.parquet", "p") == "gs://bucket/brfss.parquet"
+    assert list(fake_bucket.objects) == ["brfss.parquet"]
+    assert pq.read_table(io.BytesIO(fake_bucket.objects["brfss.parquet"])).num_rows == 25
+
+
+def test_stream_brfss_to_gcs_keeps_previous_file_on_failure(monkeypatch, fake_bucket):
+    monkeypatch.setattr(ingest, "_fetch_page", fake_fetch_page(fail_offset=0))
+    
+    with pytest.raises(aiohttp.ClientConnectionError):
+        ingest.stream_brfss_to_gcs("bucket", "brfss.parquet", "p")
+    
+    assert fake_bucket.objects == {"brfss.parquet": b"previous good file"}
+
+
+@pytest.mark.parametrize("count", [0, 25])
+def test_main_keeps_previous_file_when_extract_is_rejected(monkeypatch, fake_bucket, count):
+    # 0 rows stops before validation; 25 rows fails MIN_ROW_COUNT
+    monkeypatch.setattr(ingest, "fetch_brfss_count", lambda filters=None: count)
+    monkeypatch.setattr(ingest, "_fetch_page", fake_fetch_page())
+    monkeypatch.setattr(ingest, "GCS_BUCKET", "bucket")
+    monkeypatch.setattr(ingest, "GCS_BLOB_NAME", "brfss.parquet")
+    
+    with pytest.raises(SystemExit):
+        ingest.main()
+    
+    assert fake_bucket.objects == {"brfss.parquet": b"previous good file"}
+
+
+@pytest.mark.parametrize("partitioned", [True, False])
+def test_load_to_bigquery_recreates_table_with_other_layout(monkeypatch, brfss_df, partitioned):
+    client = FakeBigQueryClient(existing={"p.d.t": existing_table(partitioned=partitioned)})
+    monkeypatch.setattr(ingest, "_get_client", lambda project_id, credentials_path: client)
+    
+    ingest.load_to_bigquery(brfss_df, "p", "d", "t")
+    
+    dropped = ("delete", "p.d.t") in client.calls
+    assert dropped is not partitioned
+    if dropped:
+        assert client.calls.index(("delete", "p.d.t")) > max(
+            index for index, call in enumerate(client.calls) if call[0] == "load"
+        )
+
+
+def test_load_gcs_to_bigquery_recreates_unpartitioned_table(monkeypatch):
+    client = FakeBigQueryClient(existing={"p.d.t": existing_table(partitioned=False)})
+    monkeypatch.setattr(ingest, "_get_client", lambda project_id, credentials_path: client)
+    
+    table = ingest.load_gcs_to_bigquery("gs://b/x.parquet", "p", "d", "t")
+    
+    staging_ref = staging_table_ref(client)
+    assert client.calls.index(("load_uri", "gs://b/x.parquet", staging_ref, "WRITE_APPEND")) < (
+        client.calls.index(("delete", "p.d.t"))
+    )
+    assert ("copy", staging_ref, "p.d.t", "WRITE_TRUNCATE") in client.calls
+    assert table.num_rows == 25
+    assert table.range_partitioning is not None
+    assert list(client.existing) == ["p.d.t"]
+
+
+def test_load_gcs_to_bigquery_keeps_existing_table_when_load_fails(monkeypatch):
+    previous = existing_table(partitioned=False, num_rows=7)
+    client = FakeBigQueryClient(fail_job="load_uri", existing={"p.d.t": previous})
+    monkeypatch.setattr(ingest, "_get_client", lambda project_id, credentials_path: client)
+    
+    with pytest.raises(RuntimeError, match="load failed"):
+        ingest.load_gcs_to_bigquery("gs://b/x.parquet", "p", "d", "t")
+    
+    assert ("delete", "p.d.t") not in client.calls
+    assert client.existing == {"p.d.t": previous}
+
+
+@pytest.mark.parametrize("partitioned", [True, False])
+def test_load_to_bigquery_keeps_existing_table_when_copy_fails(monkeypatch, brfss_df, partitioned):
+    previous = existing_table(partitioned=partitioned, num_rows=7)
+    client = FakeBigQueryClient(fail_job="copy", existing={"p.d.t": previous})
+    monkeypatch.setattr(ingest, "_get_client", lambda project_id, credentials_path: client)
+    
+    with pytest.raises(RuntimeError, match="copy failed"):
+        ingest.load_to_bigquery(brfss_df, "p", "d", "t")
+    
+    assert client.existing == {"p.d.t": previous}